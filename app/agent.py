@@ -1,14 +1,20 @@
-from typing import TypedDict, List, Any
+from typing import Annotated, TypedDict, List, Any, Dict, Optional
 import os
 import json
+import hashlib
+import shelve
+import asyncio
+from collections import OrderedDict
 
 from langgraph.graph import StateGraph, END
+from langgraph.graph.message import add_messages
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage, ToolMessage, HumanMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_core.messages import AIMessage, ToolMessage, HumanMessage, SystemMessage
 from dotenv import load_dotenv
-from langsmith import Client
 
 from app.tools import get_property_details, get_suburb_trends
+from app.tracing import get_client, log_run
 
 
 class AgentState(TypedDict):
@@ -16,145 +22,279 @@ class AgentState(TypedDict):
 
     query: str
     result: str
-    tool_calls: List[Any]
+    # Nodes return only their new messages; add_messages appends them in place
+    tool_calls: Annotated[List[Any], add_messages]
+    # Rolling summary of tool_calls[:summarized_count], which are no longer sent verbatim
+    history_summary: str
+    summarized_count: int
 
 
 # Tool and LLM setup
 tools = [get_property_details, get_suburb_trends]
+_tools_by_name = {t.name: t for t in tools}
 
 # Load environment from .env if present
 load_dotenv()
 
-# Initialize LangSmith client for tracing and monitoring
-langsmith_client = None
-if os.getenv("LANGCHAIN_API_KEY"):
-    try:
-        langsmith_client = Client()
-        print("✅ LangSmith client initialized successfully")
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to initialize LangSmith client: {e}")
-        print("   LangSmith tracing will be disabled")
+# Initialize LangSmith client for tracing and monitoring (shared with tools and main)
+langsmith_client = get_client()
+if langsmith_client:
+    print("✅ LangSmith client initialized successfully")
+
+MODEL_NAME = "gpt-4-turbo"
+
+
+# Clients are created on first use rather than at import time. The cache lives in
+# the module dict, which importlib.reload reuses, so a reload keeps existing clients.
+_client_cache: Dict[Any, Any] = globals().setdefault("_client_cache", {})
+_AGENT_MODEL_KEY = (MODEL_NAME, tuple(t.name for t in tools))
 
-# Initialize LLM (requires OPENAI_API_KEY)
-if not os.getenv("OPENAI_API_KEY"):
-    raise RuntimeError(
-        "OPENAI_API_KEY is not set. Create a .env with OPENAI_API_KEY=... or export it."
-    )
 
-llm = ChatOpenAI(model="gpt-4-turbo")
+def get_llm() -> ChatOpenAI:
+    """Return the shared chat model (requires OPENAI_API_KEY)."""
+    llm = _client_cache.get(MODEL_NAME)
+    if llm is None:
+        if not os.getenv("OPENAI_API_KEY"):
+            raise RuntimeError(
+                "OPENAI_API_KEY is not set. Create a .env with OPENAI_API_KEY=... or export it."
+            )
+        llm = _client_cache.setdefault(MODEL_NAME, ChatOpenAI(model=MODEL_NAME))
+    return llm
+
+
+def get_tool_schemas() -> List[dict]:
+    """OpenAI tool schemas for `tools`, serialized once per tool set."""
+    key = ("schemas",) + _AGENT_MODEL_KEY[1:]
+    if key not in _client_cache:
+        _client_cache[key] = [convert_to_openai_tool(t) for t in tools]
+    return _client_cache[key]
+
+
+def get_agent_model():
+    """Return the chat model with the real estate tools bound (agent-capable model)."""
+    agent_model = _client_cache.get(_AGENT_MODEL_KEY)
+    if agent_model is None:
+        agent_model = _client_cache.setdefault(_AGENT_MODEL_KEY, get_llm().bind_tools(get_tool_schemas()))
+    return agent_model
 
-# Bind tools to create the agent-capable model
-agent_model = llm.bind_tools(tools)
 
 __all__ = [
     "AgentState",
     "tools",
-    "llm",
-    "agent_model",
+    "get_llm",
+    "get_agent_model",
+    "get_tool_schemas",
     "langsmith_client",
     "StateGraph",
     "END",
 ]
 
+# Fixed instructions sent first on every call. Providers cache prompts by exact
+# prefix, so this message is created once and never modified; per-turn context
+# (e.g. the history summary) goes in separate messages after it.
+_SYSTEM_PROMPT = SystemMessage(
+    content=(
+        "You are an Australian real-estate assistant. Use get_property_details to look up "
+        "a specific property by its address and get_suburb_trends for suburb-level "
+        "statistics. Base answers on tool results, and say so when a tool returns no data."
+    )
+)
+
+# ----------------------------
+# LLM response cache
+# ----------------------------
+
+# Exact-match cache of model responses, keyed on a hash of the prompt. The in-process
+# copy keeps the most recently used entries only; set AGENT_RESPONSE_CACHE_PATH to
+# also persist entries across processes (shelve).
+RESPONSE_CACHE_SIZE = 2048
+_response_cache: "OrderedDict[str, AIMessage]" = OrderedDict()
+_RESPONSE_CACHE_PATH = os.getenv("AGENT_RESPONSE_CACHE_PATH")
+
+
+def _response_cache_key(messages: List[Any]) -> str:
+    """Stable hash of the message list, model name and bound tool schemas.
+
+    The full schemas are hashed, not just the tool names, so persisted responses are
+    not replayed after a tool's arguments or description change.
+    """
+    payload = [
+        [m.type, m.content, getattr(m, "tool_calls", None) or [], getattr(m, "tool_call_id", None)]
+        for m in messages
+    ]
+    payload.append([MODEL_NAME, get_tool_schemas()])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _remember_response(key: str, ai_message: AIMessage) -> None:
+    """Insert or refresh an in-process entry, evicting the least recently used beyond the cap."""
+    _response_cache[key] = ai_message
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def _get_cached_response(key: str) -> Optional[AIMessage]:
+    cached = _response_cache.get(key)
+    if cached is None and _RESPONSE_CACHE_PATH:
+        try:
+            with shelve.open(_RESPONSE_CACHE_PATH) as db:
+                cached = db.get(key)
+        except Exception as e:
+            print(f"⚠️  Response cache read error: {e}")
+    if cached is not None:
+        _remember_response(key, cached)
+    # Hand out a copy so the cached message is never shared between histories
+    return cached.model_copy() if cached is not None else None
+
+
+def _store_cached_response(key: str, ai_message: AIMessage) -> None:
+    cached = ai_message.model_copy(update={"id": None})
+    _remember_response(key, cached)
+    if _RESPONSE_CACHE_PATH:
+        try:
+            with shelve.open(_RESPONSE_CACHE_PATH) as db:
+                db[key] = cached
+        except Exception as e:
+            print(f"⚠️  Response cache write error: {e}")
+
+
+# ----------------------------
+# History compression
+# ----------------------------
+
+# Number of most recent messages sent to the model verbatim; older ones are summarized
+HISTORY_WINDOW = 8
+
+
+def _window_start(messages: List[Any], target: int) -> int:
+    """Index of the first user message at or after `target` (else the last user message).
+
+    Starting the window on a user turn keeps AI tool calls and their ToolMessages together.
+    """
+    human_idx = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    for i in human_idx:
+        if i >= target:
+            return i
+    return human_idx[-1] if human_idx else 0
+
+
+async def _summarize(summary: str, messages: List[Any]) -> str:
+    transcript = "\n".join(f"{m.type}: {m.content}" for m in messages if m.content)
+    if summary:
+        transcript = f"Earlier summary: {summary}\n{transcript}"
+    response = await get_llm().ainvoke([
+        SystemMessage(content="Summarize briefly, keeping addresses, suburbs and figures:"),
+        HumanMessage(content=transcript),
+    ])
+    return response.content if isinstance(response.content, str) else str(response.content)
+
+
+async def _compress_history(messages: List[Any], summary: str, summarized_count: int, keep_last: int = HISTORY_WINDOW):
+    """Return (prompt messages, summary, summarized_count) for a sliding window plus summary.
+
+    Only messages not yet covered by `summary` are summarized, so each message is
+    summarized at most once across turns.
+    """
+    if len(messages) - summarized_count > keep_last + 2:
+        cut = _window_start(messages, len(messages) - keep_last)
+        if cut > summarized_count:
+            summary = await _summarize(summary, messages[summarized_count:cut])
+            summarized_count = cut
+    return _with_summary(messages[summarized_count:], summary), summary, summarized_count
+
+
+def _with_summary(window: List[Any], summary: str) -> List[Any]:
+    if summary:
+        return [SystemMessage(content=f"Summary of the earlier conversation: {summary}")] + window
+    return window
+
+
 # ----------------------------
 # Graph node functions
 # ----------------------------
 
-def call_model(state: AgentState):
+async def call_model(state: AgentState):
     """Invoke the tool-enabled LLM with the user's query.
 
-    Returns a dict updating the state's `tool_calls` with the model message (which may contain tool calls).
+    Returns a dict with only the new messages for `tool_calls` (the user message when a turn
+    starts, plus the model message, which may contain tool calls).
     """
     query = state["query"]
-    prior_messages = state.get("tool_calls", [])
-    # Build conversation: always append the latest user message to history
-    messages = (prior_messages or []) + [HumanMessage(content=query)]
-    
+    prior_messages = state.get("tool_calls") or []
+    # Start of a turn: append the user's message. After a tool round-trip the query
+    # is already in history, so only the tool results are new.
+    new_messages: List[Any] = []
+    if not prior_messages or not isinstance(prior_messages[-1], ToolMessage):
+        new_messages.append(HumanMessage(content=query))
+    messages = prior_messages + new_messages
+    summary = state.get("history_summary", "")
+    summarized_count = state.get("summarized_count", 0)
+
+    # The cache is keyed on the turn's state before compression, so a hit also skips
+    # the summarization call that compressing the history may need
+    prompt = [_SYSTEM_PROMPT] + _with_summary(messages[summarized_count:], summary)
+    cache_key = _response_cache_key(prompt)
+    ai_message = _get_cached_response(cache_key)
+    if ai_message is None:
+        window, summary, summarized_count = await _compress_history(messages, summary, summarized_count)
+        prompt = [_SYSTEM_PROMPT] + window
+
     # Log to LangSmith if available
-    if langsmith_client:
-        try:
-            langsmith_client.create_run(
-                "real_estate_agent_model_call",
-                {"messages": [msg.content for msg in messages if hasattr(msg, 'content')]},
-                "llm",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error: {e}")
-    
-    ai_message: AIMessage = agent_model.invoke(messages)
+    log_run(
+        "real_estate_agent_model_call",
+        {"messages": [msg.content for msg in prompt if hasattr(msg, 'content')]},
+        "llm",
+    )
+
+    if ai_message is None:
+        ai_message = await get_agent_model().ainvoke(prompt)
+        _store_cached_response(cache_key, ai_message)
     
     # Log the response to LangSmith if available
-    if langsmith_client:
-        try:
-            langsmith_client.create_run(
-                "real_estate_agent_model_response",
-                {"response": ai_message.content, "tool_calls": getattr(ai_message, 'tool_calls', [])},
-                "llm",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error: {e}")
+    log_run(
+        "real_estate_agent_model_response",
+        {"response": ai_message.content, "tool_calls": getattr(ai_message, 'tool_calls', [])},
+        "llm",
+    )
     
     # Append the AI's message to history
-    return {"tool_calls": messages + [ai_message]}
-
+    return {
+        "tool_calls": new_messages + [ai_message],
+        "history_summary": summary,
+        "summarized_count": summarized_count,
+    }
 
-def call_tool(state: AgentState):
-    """Execute the last requested tool call and append its ToolMessage to state."""
-    if not state.get("tool_calls"):
-        return {"tool_calls": []}
-
-    last_message = state["tool_calls"][-1]
-    # Expecting the last message to be an AIMessage with tool_calls
-    if not isinstance(last_message, AIMessage) or not getattr(last_message, "tool_calls", None):
-        return {"tool_calls": []}
 
-    tool_call = last_message.tool_calls[-1]
+async def _run_tool_call(tool_call: dict) -> ToolMessage:
+    """Execute a single tool call and wrap its output in a ToolMessage."""
     tool_name: str = tool_call.get("name")
     tool_args = tool_call.get("args") or {}
     tool_call_id = tool_call.get("id")
 
     # Log tool execution to LangSmith if available
-    if langsmith_client:
-        try:
-            langsmith_client.create_run(
-                f"real_estate_tool_{tool_name}",
-                {"tool_name": tool_name, "tool_args": tool_args},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error: {e}")
+    log_run(f"real_estate_tool_{tool_name}", {"tool_name": tool_name, "tool_args": tool_args}, "tool")
 
     # Find the matching tool by name
-    selected_tool = None
-    for t in tools:
-        if getattr(t, "name", None) == tool_name:
-            selected_tool = t
-            break
+    selected_tool = _tools_by_name.get(tool_name)
 
     if selected_tool is None:
         # Return a tool message indicating failure to locate tool
         content = json.dumps({"error": f"Tool not found: {tool_name}"})
-        error_message = ToolMessage(content=content, tool_call_id=tool_call_id or "")
         
         # Log tool error to LangSmith if available
-        if langsmith_client:
-            try:
-                langsmith_client.create_run(
-                    f"real_estate_tool_{tool_name}_error",
-                    {"error": content},
-                    "tool",
-                    project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                )
-            except Exception as e:
-                print(f"⚠️  LangSmith logging error: {e}")
+        log_run(f"real_estate_tool_{tool_name}_error", {"error": content}, "tool")
         
-        return {"tool_calls": [error_message]}
+        return ToolMessage(content=content, tool_call_id=tool_call_id or "")
 
-    # Invoke tool with provided arguments
-    output = selected_tool.invoke(tool_args)
+    # Invoke tool with provided arguments. A failure is reported back as this call's
+    # result so the other calls gathered alongside it still complete
+    try:
+        output = await selected_tool.ainvoke(tool_args)
+    except Exception as e:
+        content = json.dumps({"error": f"Tool {tool_name} failed: {e}"})
+        log_run(f"real_estate_tool_{tool_name}_error", {"error": content}, "tool")
+        return ToolMessage(content=content, tool_call_id=tool_call_id or "")
 
     # Tool outputs should be JSON-serializable; ensure string content
     if not isinstance(output, str):
@@ -166,20 +306,29 @@ def call_tool(state: AgentState):
         content = output
 
     # Log tool success to LangSmith if available
-    if langsmith_client:
-        try:
-            langsmith_client.create_run(
-                f"real_estate_tool_{tool_name}_success",
-                {"result": content},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error: {e}")
+    log_run(f"real_estate_tool_{tool_name}_success", {"result": content}, "tool")
+
+    return ToolMessage(content=content, tool_call_id=tool_call_id or "")
+
+
+async def call_tool(state: AgentState):
+    """Execute every tool call requested by the last AI message and append their ToolMessages.
+
+    The model may request several tools in one message; they are run concurrently and
+    answered together, so none is dropped and no extra model round-trip is needed.
+    """
+    if not state.get("tool_calls"):
+        return {"tool_calls": []}
+
+    last_message = state["tool_calls"][-1]
+    # Expecting the last message to be an AIMessage with tool_calls
+    if not isinstance(last_message, AIMessage) or not getattr(last_message, "tool_calls", None):
+        return {"tool_calls": []}
 
-    tool_message = ToolMessage(content=content, tool_call_id=tool_call_id or "")
-    # Append tool output to history
-    return {"tool_calls": state["tool_calls"] + [tool_message]}
+    # gather preserves order, so results line up with the requested tool calls
+    results = await asyncio.gather(*(_run_tool_call(tool_call) for tool_call in last_message.tool_calls))
+    # Append tool outputs to history
+    return {"tool_calls": list(results)}
 
 
 def should_continue(state: AgentState):
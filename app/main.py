@@ -1,6 +1,7 @@
 from app.agent import app, langsmith_client
+from app.tracing import log_run
 from typing import List
-import os
+import asyncio
 import uuid
 from datetime import datetime
 
@@ -25,7 +26,6 @@ def _extract_final_output(state: dict) -> str:
 
 
 def main() -> None:
-    history: List[object] = []
     session_id = str(uuid.uuid4())
     
     print("🏠 Australian Real Estate AI Agent")
@@ -38,6 +38,27 @@ def main() -> None:
         print("⚠️  LangSmith tracing disabled (set LANGCHAIN_API_KEY to enable)")
     print("=" * 40)
     
+    # One event loop for the whole session. The prompt is read in the main thread
+    # between turns, while the loop is idle: a worker thread blocked in input() would
+    # keep Ctrl-C from exiting until a line arrived.
+    loop = asyncio.new_event_loop()
+    try:
+        _run_session(loop, session_id)
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+    print(f"\n👋 Session ended. Session ID: {session_id}")
+    if langsmith_client:
+        print("📊 Check your LangSmith dashboard for detailed traces and analytics")
+
+
+def _run_session(loop: asyncio.AbstractEventLoop, session_id: str) -> None:
+    history: List[object] = []
+    memory: dict = {}
+
     while True:
         user_input = input("\nAsk a question about Melbourne real estate (type 'exit' to quit): ")
         if user_input.strip().lower() == "exit":
@@ -45,19 +66,10 @@ def main() -> None:
 
         try:
             # Log conversation start to LangSmith if available
-            if langsmith_client:
-                try:
-                    langsmith_client.create_run(
-                        "real_estate_conversation",
-                        {"user_query": user_input, "session_id": session_id},
-                        "chain",
-                        project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                    )
-                except Exception as e:
-                    print(f"⚠️  LangSmith logging error: {e}")
+            log_run("real_estate_conversation", {"user_query": user_input, "session_id": session_id}, "chain")
             
-            # Persist conversation by passing prior tool_calls history
-            state = app.invoke({"query": user_input, "tool_calls": history})
+            # Persist conversation by passing prior tool_calls history and its summary
+            state = loop.run_until_complete(app.ainvoke({"query": user_input, "tool_calls": history, **memory}))
             output = _extract_final_output(state)
             
             print("\n=== Agent Response ===")
@@ -65,36 +77,15 @@ def main() -> None:
             print("======================\n")
             
             # Log conversation completion to LangSmith if available
-            if langsmith_client:
-                try:
-                    langsmith_client.create_run(
-                        "real_estate_conversation_complete",
-                        {"agent_response": output, "session_id": session_id},
-                        "chain",
-                        project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                    )
-                except Exception as e:
-                    print(f"⚠️  LangSmith logging error: {e}")
+            log_run("real_estate_conversation_complete", {"agent_response": output, "session_id": session_id}, "chain")
             
             # Update history for next turn
             history = state.get("tool_calls", history)
+            memory = {key: state[key] for key in ("history_summary", "summarized_count") if key in state}
         except Exception as e:
             print(f"Error: {e}")
             # Log error to LangSmith if available
-            if langsmith_client:
-                try:
-                    langsmith_client.create_run(
-                        "real_estate_conversation_error",
-                        {"error": str(e), "session_id": session_id},
-                        "chain",
-                        project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                    )
-                except Exception as langsmith_error:
-                    print(f"⚠️  LangSmith logging error: {langsmith_error}")
-    
-    print(f"\n👋 Session ended. Session ID: {session_id}")
-    if langsmith_client:
-        print("📊 Check your LangSmith dashboard for detailed traces and analytics")
+            log_run("real_estate_conversation_error", {"error": str(e), "session_id": session_id}, "chain")
 
 
 if __name__ == "__main__":
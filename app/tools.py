@@ -1,10 +1,28 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
-from langsmith import Client
+
+try:
+    from app.tracing import log_run
+except ImportError:  # running this file directly as a script
+    from tracing import log_run
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    import json
+    _json_loads = json.loads
 
 # Support running as module (python -m app.tools) and as script (python app/tools.py)
 try:
@@ -12,13 +30,44 @@ try:
 except ModuleNotFoundError:  # When executed as a script, use local import
     from models import Property, SuburbTrends  # type: ignore
 
+# First number in a listing's display price, thousands separators included,
+# e.g. "1,250,000" in "$1,250,000 - $1,300,000"
+_PRICE_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)")
+
+
+def _normalize_key(text: str) -> str:
+    """Lookup key for addresses and suburbs; indexes and queries must agree on it."""
+    return text.strip().casefold()
+
 
 class RealEstateDataProvider:
     """Provides access and simple analytics over real estate data via Domain.com.au API.
 
-    Uses HTTP API to query real estate listings on demand.
+    Live listings are fetched from the HTTP API once and indexed for
+    case-insensitive address and suburb lookups.
     """
 
+    REQUIRED_COLUMNS = ["Address", "Suburb", "Rooms", "Type", "Price", "Bathroom", "Landsize", "YearBuilt"]
+    # Dtypes used when converting rows to records, so integers come out as int
+    RECORD_DTYPES = {
+        "Rooms": "Int64", "Bathroom": "Int64", "YearBuilt": "Int64",
+        "Price": "float64", "Landsize": "float64",
+    }
+    # Columns that must be present for a row to form a valid Property
+    PROPERTY_REQUIRED = ("Address", "Suburb", "Rooms", "Type", "Price")
+    # Explicit storage dtypes for the columns used in lookups and aggregates
+    # Addresses are unique per listing, so they are kept in a packed Arrow string buffer
+    # rather than as categories or one Python str object per cell. Price and Landsize
+    # stay float64: float32 rounds prices above 2**24 and leaks into the trend figures.
+    COLUMN_DTYPES = {
+        "Address": "string[pyarrow]", "Suburb": "category", "Type": "category",
+        "Price": "float64", "Landsize": "float64",
+    }
+    # Largest page the listings endpoint serves; same 1000-listing cap in half the requests
+    PAGE_SIZE = 200
+    MAX_PAGES = 5
+    # Concurrent page requests; stays within requests' default pool of 10 connections per host
+    FETCH_WORKERS = 8
 
     def __init__(self, api_base_url: str) -> None:
         self.api_base_url = api_base_url.strip("/")
@@ -34,22 +83,35 @@ class RealEstateDataProvider:
         self._api_headers["accept"] = "application/json"
         self._api_headers["X-Api-Call-Source"] = "live-api-browser"
 
+        # Optional Parquet copy of the listings so restarts can skip the API scan
+        self._snapshot_path: Optional[str] = os.getenv("REAL_ESTATE_SNAPSHOT_PATH")
+        self._snapshot_max_age: float = float(os.getenv("REAL_ESTATE_SNAPSHOT_MAX_AGE") or 3600)
+
+        # Listing snapshot and casefold lookup indexes. _load_data is the only writer
+        # and replaces them wholesale; lookups read them in place and never copy.
+        self.df: Optional[pd.DataFrame] = None
+        self._by_address: Dict[str, int] = {}
+        self._suburb_stats: Dict[str, Tuple[float, int, float]] = {}
+        self._suburb_canonical: Dict[str, str] = {}
+        # Bumped on every successful load so callers can key caches on the snapshot
+        self.data_version: int = 0
+        # Live listings change, so the in-memory snapshot is refetched after this many seconds
+        self._ttl: float = float(os.getenv("REAL_ESTATE_CACHE_TTL") or 300)
+        self._loaded_at: float = float("-inf")
+        # Tool calls may run concurrently; only one of them should fetch the listings
+        self._load_lock = threading.Lock()
 
     # -------- API helpers --------
-    def _parse_price_from_text(self, text: Optional[str]) -> float:
-        if not text:
-            return 0.0
-        try:
-            import re
-            numbers = re.findall(r"\d+[\,\.]?\d*", text)
-            if not numbers:
-                return 0.0
-            numeric = numbers[0].replace(",", "")
-            return float(numeric)
-        except Exception:
-            return 0.0
+    def _parse_prices(self, texts: pd.Series) -> pd.Series:
+        """Parse display-price texts into floats in one vectorized pass (0.0 when absent).
 
-    def _map_external_property(self, item: dict) -> pd.Series:
+        Takes the first number in each text, e.g. "$1,250,000" -> 1250000.0.
+        """
+        numbers = texts.astype("string[pyarrow]").str.extract(_PRICE_RE, expand=False)
+        numbers = numbers.str.replace(",", "", regex=False)
+        return pd.to_numeric(numbers, errors="coerce").astype("float64").fillna(0.0)
+
+    def _map_external_property(self, item: dict) -> dict:
         """Map an external API listing (Domain-style) to our canonical columns."""
         address_parts = item.get("addressParts", {}) or {}
         display_address = address_parts.get("displayAddress")
@@ -80,40 +142,203 @@ class RealEstateDataProvider:
         property_type = property_types[0] if property_types else None
 
         price_details = item.get("priceDetails") or {}
+        # Display text is parsed for all listings at once in _fetch_listings
         display_price = price_details.get("displayPrice")
-        price_value = self._parse_price_from_text(display_price)
 
         mapped = {
             "Address": display_address,
             "Suburb": address_parts.get("suburb"),
             "Rooms": int(item.get("bedrooms") or 0) if item.get("bedrooms") is not None else None,
             "Type": property_type or "",
-            "Price": price_value,
+            "Price": display_price,
             "Bathroom": int(item.get("bathrooms") or 0) if item.get("bathrooms") is not None else 0,
             "Landsize": float(item.get("landSize") or 0.0) if item.get("landSize") is not None else 0.0,
             "YearBuilt": int(item.get("yearBuilt")) if item.get("yearBuilt") is not None else None,
         }
-        return pd.Series(mapped)
-
-
-    def _row_to_property(self, row: pd.Series) -> Property:
-        """Convert a DataFrame row into a Property model using alias keys."""
-        data = {
-            "Address": row.get("Address"),
-            "Suburb": row.get("Suburb"),
-            "Rooms": int(row.get("Rooms")) if pd.notna(row.get("Rooms")) else None,
-            "Type": row.get("Type"),
-            "Price": float(row.get("Price")) if pd.notna(row.get("Price")) else None,
-            "Bathroom": int(row.get("Bathroom")) if pd.notna(row.get("Bathroom")) else 0,
-            "Landsize": float(row.get("Landsize")) if pd.notna(row.get("Landsize")) else 0.0,
-            "YearBuilt": int(row.get("YearBuilt")) if pd.notna(row.get("YearBuilt")) else None,
-        }
+        return mapped
+
+
+    def _fetch_page(self, page: int, page_size: int) -> Tuple[List[dict], Optional[int]]:
+        """Fetch a single page of live listings from the agency endpoint.
+
+        Returns the page's items and the total listing count when the API reports it.
+        """
+        query = urlencode({
+            "listingStatusFilter": "live",
+            "pageNumber": page,
+            "pageSize": page_size,
+        })
+        url = f"{self.api_base_url}/v1/agencies/{self._agency_id}/listings?{query}"
+        resp = self._http.get(url, headers=self._api_headers, timeout=25)
+        resp.raise_for_status()
+        total = resp.headers.get("X-Total-Count")
+        total_count = int(total) if total and total.isdigit() else None
+        data = _json_loads(resp.content) or []
+        if isinstance(data, dict):
+            return data.get("results") or data.get("data") or [], total_count
+        return data, total_count
+
+    def _fetch_listings(self) -> pd.DataFrame:
+        """Page through the agency's live listings into a typed DataFrame."""
+        first_page, total_count = self._fetch_page(1, self.PAGE_SIZE)
+        pages = [first_page]
+        if len(first_page) == self.PAGE_SIZE:
+            # Remaining pages are fetched concurrently; without a reported total, every
+            # page up to MAX_PAGES is requested and the results are cut at the first short page
+            last_page = self.MAX_PAGES
+            if total_count is not None:
+                last_page = min(self.MAX_PAGES, -(-total_count // self.PAGE_SIZE))
+            if last_page > 1:
+                with ThreadPoolExecutor(max_workers=min(self.FETCH_WORKERS, last_page - 1)) as executor:
+                    rest = executor.map(lambda page: self._fetch_page(page, self.PAGE_SIZE)[0], range(2, last_page + 1))
+                    for items in rest:
+                        pages.append(items)
+                        if len(items) < self.PAGE_SIZE:
+                            break
+
+        rows: List[dict] = [self._map_external_property(item) for items in pages for item in items]
+
+        # Mapped listings become a single frame, typed in one step
+        df = pd.DataFrame.from_records(rows, columns=self.REQUIRED_COLUMNS)
+        df["Price"] = self._parse_prices(df["Price"])
+        df = df.astype(self.COLUMN_DTYPES)
+        return df.fillna({"Landsize": 0.0}).reset_index(drop=True)
+
+    # -------- On-disk snapshot --------
+    # Parquet schema metadata key recording which listings endpoint produced a snapshot
+    SNAPSHOT_SOURCE_KEY = b"real_estate_listings_source"
+
+    def _listings_source(self) -> bytes:
+        return f"{self.api_base_url}/v1/agencies/{self._agency_id}/listings".encode()
+
+    def _read_snapshot(self) -> Optional[Tuple[pd.DataFrame, float]]:
+        """Load the Parquet listing snapshot if it is fresh enough and from this provider's source.
+
+        Returns the frame and the snapshot's age in seconds.
+        """
+        path = self._snapshot_path
+        if not path or not os.path.exists(path):
+            return None
+        age = max(0.0, time.time() - os.path.getmtime(path))
+        if age > self._snapshot_max_age:
+            return None
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+            if metadata.get(self.SNAPSHOT_SOURCE_KEY) != self._listings_source():
+                # Written for another API base or agency
+                return None
+            # Snapshots written by older versions may predate the current dtypes
+            return pd.read_parquet(path, engine="pyarrow").astype(self.COLUMN_DTYPES), age
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to read listing snapshot {path}: {e}")
+            return None
 
+    def _write_snapshot(self, df: pd.DataFrame) -> None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = {**(table.schema.metadata or {}), self.SNAPSHOT_SOURCE_KEY: self._listings_source()}
+            pq.write_table(table.replace_schema_metadata(metadata), self._snapshot_path, compression="zstd")
+        except Exception as e:
+            print(f"⚠️  Warning: Failed to write listing snapshot {self._snapshot_path}: {e}")
+
+    def _load_data(self, use_snapshot: bool = True) -> None:
+        """Load the listings (snapshot or API) and build case-insensitive lookup indexes."""
+        snapshot = self._read_snapshot() if use_snapshot else None
+        if snapshot is not None:
+            df, age = snapshot
+        else:
+            df, age = self._fetch_listings(), 0.0
+            if self._snapshot_path:
+                self._write_snapshot(df)
+
+        # Casefolded address -> first matching row position, keyed with _normalize_key
+        # as the index is built
+        by_address: Dict[str, int] = {}
+        for i, addr in enumerate(df["Address"].to_numpy(dtype=object, na_value="")):
+            key = _normalize_key(addr)
+            if key:
+                by_address.setdefault(key, i)
+
+        # Casefolded suburb -> (median price, count, mean land size) over priced listings,
+        # aggregated once here so trend lookups are a dict access
+        # Casefold only the (few) suburb categories, then expand by code; code -1
+        # (missing suburb) indexes the trailing "" entry
+        suburb_lower = np.array(
+            [_normalize_key(name) for name in df["Suburb"].cat.categories] + [""], dtype=object
+        )
+        suburb_norm = pd.Series(suburb_lower[df["Suburb"].cat.codes.to_numpy()], index=df.index)
+        priced = df["Price"].notna() & (suburb_norm != "")
+        grouped = df[priced].groupby(suburb_norm[priced], sort=False)
+        stats = grouped.agg(
+            median_price=("Price", "median"),
+            property_count=("Price", "size"),
+            average_land_size=("Landsize", "mean"),
+        )
+        suburb_stats = {key: tuple(values) for key, *values in stats.itertuples(name=None)}
+        suburb_canonical = grouped["Suburb"].first().to_dict()
+
+        self.df = df
+        self._by_address = by_address
+        self._suburb_stats = suburb_stats
+        self._suburb_canonical = suburb_canonical
+        self.data_version += 1
+        # The TTL counts from when the listings were fetched, including time spent on disk
+        self._loaded_at = time.monotonic() - age
+
+    def _is_fresh(self) -> bool:
+        return self.df is not None and time.monotonic() - self._loaded_at < self._ttl
+
+    def _ensure_loaded(self) -> None:
+        """Load the listings on first use and refresh them once they are older than the TTL."""
+        if self._is_fresh():
+            return
+        with self._load_lock:
+            if self._is_fresh():
+                return
+            if self.df is None:
+                self._load_data()
+                return
+            try:
+                # The on-disk snapshot is only for startup; a refresh always goes to the API
+                self._load_data(use_snapshot=False)
+            except Exception as e:
+                # Keep serving the previous listings and retry after another TTL
+                print(f"⚠️  Warning: Failed to refresh listings, serving cached data: {e}")
+                self._loaded_at = time.monotonic()
+
+    def current_version(self) -> int:
+        """Load or refresh the listings if needed and return their data_version (0 if unavailable)."""
+        try:
+            self._ensure_loaded()
+        except Exception:
+            pass
+        return self.data_version
+
+    def invalidate(self) -> None:
+        """Force the next lookup to refetch listings from the API."""
+        self._loaded_at = float("-inf")
+
+    def _to_records(self, df: pd.DataFrame) -> List[dict]:
+        """Convert listing rows into alias-keyed dicts of native values.
+
+        Missing values become None, except Bathroom/Landsize which default to 0.
+        """
+        typed = df[self.REQUIRED_COLUMNS].fillna({"Bathroom": 0, "Landsize": 0.0}).astype(self.RECORD_DTYPES)
+        return typed.astype(object).where(typed.notna(), None).to_dict(orient="records")
+
+    def _record_to_property(self, record: dict) -> Property:
+        """Convert a listing record into a Property model using alias keys."""
         validator = getattr(Property, "model_validate", None)
         if callable(validator):
-            return validator(data)
+            return validator(record)
         # Pydantic v1
-        return Property.parse_obj(data)
+        return Property.parse_obj(record)
+
+    def _find_record(self, address: str) -> Optional[dict]:
+        self._ensure_loaded()
+        idx = self._by_address.get(_normalize_key(address))
+        # Only the matched row is converted; the frame stays the single copy of the listings
+        return None if idx is None else self._to_records(self.df.iloc[[idx]])[0]
 
     def find_property_by_address(self, address: str) -> Optional[Property]:
         """Find a single property by exact address (case-insensitive)."""
@@ -121,38 +346,24 @@ class RealEstateDataProvider:
             return None
 
         try:
-            # Fetch listings from agency endpoint and filter client-side by full address
-            # Pagination loop with sane cap
-            page = 1
-            page_size = 50
-            address_norm = address.strip().casefold()
-            while page <= 10:
-                query = urlencode({
-                    "listingStatusFilter": "live",
-                    "pageNumber": page,
-                    "pageSize": page_size,
-                })
-                url = f"{self.api_base_url}/v1/agencies/{self._agency_id}/listings?{query}"
-                resp = self._http.get(url, headers=self._api_headers, timeout=20)
-                resp.raise_for_status()
-                data = resp.json() or []
-                if isinstance(data, dict):
-                    items = data.get("results") or data.get("data") or []
-                else:
-                    items = data
-                if not items:
-                    break
-                for item in items:
-                    row = self._map_external_property(item)
-                    row_addr = str(row.get("Address") or "").strip().casefold()
-                    if row_addr and row_addr == address_norm:
-                        return self._row_to_property(row)
-                if len(items) < page_size:
-                    break
-                page += 1
+            record = self._find_record(address)
+            return None if record is None else self._record_to_property(record)
+        except Exception:
+            return None
+
+    def find_property_dict_by_address(self, address: str) -> Optional[dict]:
+        """Like find_property_by_address, but return the alias-keyed dict without model validation."""
+        if not address:
             return None
+
+        try:
+            record = self._find_record(address)
         except Exception:
             return None
+        # Same required fields the Property model enforces
+        if record is None or any(record[key] is None for key in self.PROPERTY_REQUIRED):
+            return None
+        return record
 
     def calculate_suburb_trends(self, suburb: str) -> Optional[SuburbTrends]:
         """Calculate median price, count, and average land size for a suburb (case-insensitive)."""
@@ -160,50 +371,17 @@ class RealEstateDataProvider:
             return None
 
         try:
-            # Aggregate listings from the agency endpoint and compute trends client-side
-            page = 1
-            page_size = 100
-            rows: List[pd.Series] = []
-            suburb_norm = suburb.strip().casefold()
-            while page <= 10:
-                query = urlencode({
-                    "listingStatusFilter": "live",
-                    "pageNumber": page,
-                    "pageSize": page_size,
-                })
-                url = f"{self.api_base_url}/v1/agencies/{self._agency_id}/listings?{query}"
-                resp = self._http.get(url, headers=self._api_headers, timeout=25)
-                resp.raise_for_status()
-                data = resp.json() or []
-                if isinstance(data, dict):
-                    items = data.get("results") or data.get("data") or []
-                else:
-                    items = data
-                if not items:
-                    break
-                for item in items:
-                    s = self._map_external_property(item)
-                    s_suburb = str(s.get("Suburb") or "").casefold()
-                    if s_suburb == suburb_norm:
-                        rows.append(s)
-                if len(items) < page_size:
-                    break
-                page += 1
-            if not rows:
-                return None
-            df = pd.DataFrame(rows)
-            df = df.dropna(subset=["Price"]) if "Price" in df.columns else df
-            if df.empty:
+            self._ensure_loaded()
+            key = _normalize_key(suburb)
+            stats = self._suburb_stats.get(key)
+            if stats is None:
                 return None
-            median_price = float(df["Price"].median()) if "Price" in df.columns else 0.0
-            property_count = int(len(df))
-            average_land_size = float(df["Landsize"].mean()) if "Landsize" in df.columns else 0.0
-            canonical_suburb = str(df.iloc[0]["Suburb"]) if "Suburb" in df.columns else suburb
+            median_price, property_count, average_land_size = stats
             return SuburbTrends(
-                suburb=canonical_suburb or suburb,
-                median_price=median_price,
-                property_count=property_count,
-                average_land_size=average_land_size,
+                suburb=str(self._suburb_canonical.get(key) or suburb),
+                median_price=float(median_price),
+                property_count=int(property_count),
+                average_land_size=float(average_land_size),
             )
         except Exception:
             return None
@@ -211,21 +389,78 @@ class RealEstateDataProvider:
 # ----------------------------
 # LangChain tool integrations
 # ----------------------------
+from functools import lru_cache
+
 from langchain.tools import tool
 from pydantic import BaseModel as PydanticModel, Field
-from pathlib import Path
 
 # Configure data source: always use Domain.com.au API
-_API_BASE = os.getenv("REAL_ESTATE_API_BASE") or "https://api.domain.com.au/sandbox"
-_provider = RealEstateDataProvider(api_base_url=_API_BASE)
+_DEFAULT_API_BASE = "https://api.domain.com.au/sandbox"
 
-# Initialize LangSmith client for tool tracing
-_langsmith_client = None
-if os.getenv("LANGCHAIN_API_KEY"):
-    try:
-        _langsmith_client = Client()
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to initialize LangSmith client in tools: {e}")
+
+_provider_cache: dict = globals().setdefault("_provider_cache", {})
+
+
+def _get_provider() -> RealEstateDataProvider:
+    """Return the shared data provider, created on first tool use rather than at import.
+
+    The cache survives importlib.reload, but a provider built from an earlier definition
+    of RealEstateDataProvider is replaced so reloaded code takes effect.
+    """
+    provider = _provider_cache.get("provider")
+    if type(provider) is not RealEstateDataProvider:
+        # Read at first use so values loaded from .env after import are honoured
+        api_base = os.getenv("REAL_ESTATE_API_BASE") or _DEFAULT_API_BASE
+        fresh = RealEstateDataProvider(api_base_url=api_base)
+        if provider is None:
+            provider = _provider_cache.setdefault("provider", fresh)
+        else:
+            provider = _provider_cache["provider"] = fresh
+    return provider
+
+
+def _property_details(address_norm: str) -> Optional[dict]:
+    """Look up a property and serialize it using original dataset column names via aliases."""
+    # The provider returns the alias-keyed dict directly
+    return _get_provider().find_property_dict_by_address(address_norm)
+
+
+def _suburb_trends(suburb_norm: str) -> Optional[dict]:
+    """Calculate suburb trends and serialize them to a plain dict."""
+    result = _get_provider().calculate_suburb_trends(suburb_norm)
+    if result is None:
+        return None
+    dumper = getattr(result, "model_dump", None)
+    if callable(dumper):
+        return dumper()
+    return result.dict()
+
+
+# Tool results are memoized per listing snapshot: `data_version` is part of the
+# key, so entries from a previous snapshot are never served after a refresh.
+@lru_cache(maxsize=1024)
+def _cached_property_details(address_norm: str, data_version: int) -> Optional[dict]:
+    return _property_details(address_norm)
+
+
+@lru_cache(maxsize=1024)
+def _cached_suburb_trends(suburb_norm: str, data_version: int) -> Optional[dict]:
+    return _suburb_trends(suburb_norm)
+
+
+def _lookup_property_details(address: str) -> Optional[dict]:
+    data_version = _get_provider().current_version()
+    if not data_version:
+        # Listings could not be loaded; don't cache the miss
+        return None
+    return _cached_property_details(_normalize_key(address), data_version)
+
+
+def _lookup_suburb_trends(suburb: str) -> Optional[dict]:
+    data_version = _get_provider().current_version()
+    if not data_version:
+        return None
+    return _cached_suburb_trends(_normalize_key(suburb), data_version)
 
 
 class PropertySearchInput(PydanticModel):
@@ -236,50 +471,16 @@ class PropertySearchInput(PydanticModel):
 def get_property_details(address: str):
     """Searches for and retrieves the details of a specific property by its address."""
     # Log tool execution to LangSmith if available
-    if _langsmith_client:
-        try:
-            _langsmith_client.create_run(
-                "get_property_details",
-                {"address": address},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error in get_property_details: {e}")
+    log_run("get_property_details", {"address": address}, "tool")
     
-    result = _provider.find_property_by_address(address)
-    if result is None:
+    output = _lookup_property_details(address)
+    if output is None:
         # Log no result found
-        if _langsmith_client:
-            try:
-                _langsmith_client.create_run(
-                    "get_property_details_no_result",
-                    {"result": None, "message": f"No property found for address: {address}"},
-                    "tool",
-                    project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                )
-            except Exception as e:
-                print(f"⚠️  LangSmith logging error in get_property_details: {e}")
+        log_run("get_property_details_no_result", {"result": None, "message": f"No property found for address: {address}"}, "tool")
         return None
     
-    # Return a JSON-serializable dict using original dataset column names via aliases
-    dumper = getattr(result, "model_dump", None)
-    if callable(dumper):
-        output = dumper(by_alias=True)
-    else:
-        output = result.dict(by_alias=True)
-    
     # Log successful result to LangSmith if available
-    if _langsmith_client:
-        try:
-            _langsmith_client.create_run(
-                "get_property_details_success",
-                {"result": output, "message": f"Property found for address: {address}"},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error in get_property_details: {e}")
+    log_run("get_property_details_success", {"result": output, "message": f"Property found for address: {address}"}, "tool")
     
     return output
 
@@ -292,49 +493,16 @@ class SuburbTrendsInput(PydanticModel):
 def get_suburb_trends(suburb: str):
     """Calculates and returns the median price, property count, and average land size for a given suburb."""
     # Log tool execution to LangSmith if available
-    if _langsmith_client:
-        try:
-            _langsmith_client.create_run(
-                "get_suburb_trends",
-                {"suburb": suburb},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error in get_suburb_trends: {e}")
+    log_run("get_suburb_trends", {"suburb": suburb}, "tool")
     
-    result = _provider.calculate_suburb_trends(suburb)
-    if result is None:
+    output = _lookup_suburb_trends(suburb)
+    if output is None:
         # Log no result found
-        if _langsmith_client:
-            try:
-                _langsmith_client.create_run(
-                    "get_suburb_trends_no_result",
-                    {"result": None, "message": f"No data found for suburb: {suburb}"},
-                    "tool",
-                    project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-                )
-            except Exception as e:
-                print(f"⚠️  LangSmith logging error in get_suburb_trends: {e}")
+        log_run("get_suburb_trends_no_result", {"result": None, "message": f"No data found for suburb: {suburb}"}, "tool")
         return None
     
-    dumper = getattr(result, "model_dump", None)
-    if callable(dumper):
-        output = dumper()
-    else:
-        output = result.dict()
-    
     # Log successful result to LangSmith if available
-    if _langsmith_client:
-        try:
-            _langsmith_client.create_run(
-                "get_suburb_trends_success",
-                {"result": output, "message": f"Trends calculated for suburb: {suburb}"},
-                "tool",
-                project_name=os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
-            )
-        except Exception as e:
-            print(f"⚠️  LangSmith logging error in get_suburb_trends: {e}")
+    log_run("get_suburb_trends_success", {"result": output, "message": f"Trends calculated for suburb: {suburb}"}, "tool")
     
     return output
 
@@ -0,0 +1,101 @@
+from typing import Any, Dict, Optional
+import atexit
+import os
+import queue
+import threading
+
+from langsmith import Client
+
+
+class RunQueue:
+    """Sends LangSmith runs from a background thread instead of the agent hot path.
+
+    `Client.create_run` is a blocking HTTPS call; queueing runs keeps tracing
+    overhead on the caller's side to a `put_nowait`. Runs are dropped rather than
+    blocking when the queue is full.
+    """
+
+    BATCH_SIZE = 64
+
+    def __init__(self, client: Client, project_name: Optional[str] = None, maxsize: int = 10_000) -> None:
+        self.client = client
+        self.project_name = project_name or os.getenv("LANGCHAIN_PROJECT", "Australian-Real-Estate-Agent")
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=maxsize)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def log(self, name: str, inputs: Dict[str, Any], run_type: str) -> None:
+        """Queue a run for the background worker; never blocks or raises."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait({"name": name, "inputs": inputs, "run_type": run_type})
+        except queue.Full:
+            pass
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait (up to `timeout` seconds) for queued runs to be sent."""
+        with self._queue.all_tasks_done:
+            self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="langsmith-runs", daemon=True)
+                self._worker.start()
+                atexit.register(self.flush)
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for run in batch:
+                try:
+                    self.client.create_run(
+                        run["name"],
+                        run["inputs"],
+                        run["run_type"],
+                        project_name=self.project_name,
+                    )
+                except Exception as e:
+                    print(f"⚠️  LangSmith logging error: {e}")
+                finally:
+                    self._queue.task_done()
+
+
+# Client and queue shared by agent, tools and main
+_tracing_cache: Dict[str, Any] = {}
+
+
+def get_client() -> Optional[Client]:
+    """Return the shared LangSmith client, or None when LANGCHAIN_API_KEY is unset or init fails."""
+    if "client" not in _tracing_cache:
+        client = None
+        if os.getenv("LANGCHAIN_API_KEY"):
+            try:
+                client = Client()
+            except Exception as e:
+                print(f"⚠️  Warning: Failed to initialize LangSmith client: {e}")
+                print("   LangSmith tracing will be disabled")
+        _tracing_cache.setdefault("client", client)
+    return _tracing_cache["client"]
+
+
+def get_run_queue() -> Optional[RunQueue]:
+    """Return the shared run queue, created on first use; None when tracing is disabled."""
+    if "run_queue" not in _tracing_cache:
+        client = get_client()
+        _tracing_cache.setdefault("run_queue", RunQueue(client) if client is not None else None)
+    return _tracing_cache["run_queue"]
+
+
+def log_run(name: str, inputs: Dict[str, Any], run_type: str) -> None:
+    """Queue a LangSmith run on the shared queue; a no-op when tracing is disabled."""
+    run_queue = get_run_queue()
+    if run_queue is not None:
+        run_queue.log(name, inputs, run_type)